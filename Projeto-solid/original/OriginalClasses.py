@@ -1,9 +1,25 @@
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from decimal import Decimal, InvalidOperation, getcontext
-from datetime import datetime
+from decimal import ROUND_HALF_EVEN, Context, Decimal, InvalidOperation, getcontext
+from enum import IntEnum
+from datetime import datetime, timezone
 from typing import Dict, List, Tuple
 
+try:
+    from recordclass import dataobject
+except ImportError:
+    dataobject = None
+
 getcontext().prec = 28
+# centavos limitados a int64 (o mesmo do lote) para qualquer tipo de entrada;
+# prec=19 cobre todos os dígitos desse intervalo no quantize
+_MONEY_CTX = Context(prec=19, rounding=ROUND_HALF_EVEN)
+_MAX_CENTS = 2**63 - 1
+_CENTS = Decimal("0.01")
 
 class ErroBanco(Exception):
     pass
@@ -17,50 +33,105 @@ class SaldoInsuficiente(ErroBanco):
 class EntidadeNaoEncontrada(ErroBanco):
     pass
 
-@dataclass(frozen=True)
+class Tipo(IntEnum):
+    DEPOSITO = 0
+    SAQUE = 1
+    TRANSFERENCIA = 2
+
+_TIPO_NAMES = {t: t.name for t in Tipo}
+
+_DESC_DEPOSITO = sys.intern("depósito")
+_DESC_SAQUE = sys.intern("saque")
+_DESC_TRANSFERENCIA = sys.intern("transferência")
+
+# Cliente fica sempre como dataclass: dataobject ignoraria o __eq__/__hash__ por id
+@dataclass(frozen=True, slots=True, eq=False)
 class Cliente:
     id: int
     nome: str
     cpf: str
 
-@dataclass
-class Transacao:
-    momento: datetime
-    tipo: str
-    valor: Decimal
-    descricao: str
-    origem: str = ""
-    destino: str = ""
-
-@dataclass
+    # identidade do cliente é o id: hash/eq num único int em vez da tupla dos três campos
+    def __hash__(self) -> int:
+        return self.id
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return other.id == self.id
+
+if dataobject is not None:
+    class Transacao(dataobject):
+        momento: int
+        tipo: int
+        valor: int
+        descricao: str
+        origem: str = ""
+        destino: str = ""
+else:
+    @dataclass
+    class Transacao:
+        momento: int
+        tipo: int
+        valor: int
+        descricao: str
+        origem: str = ""
+        destino: str = ""
+
+class _ReadOnlyList(Sequence):
+    __slots__ = ("_itens",)
+
+    def __init__(self, itens: List[Transacao]):
+        self._itens = itens
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def __getitem__(self, i):
+        return self._itens[i]
+
+    def __iter__(self):
+        return iter(self._itens)
+
+@dataclass(slots=True)
 class Conta:
     numero: str
     cliente: Cliente
-    saldo: Decimal = Decimal("0.00")
+    saldo: int = 0
     historico: List[Transacao] = field(default_factory=list)
 
-    def depositar(self, valor: Decimal, descricao: str = ""):
+    def depositar(self, valor: int, descricao: str = ""):
+        self._depositar_raw(valor)
+        self.historico.append(Transacao(time.time_ns() // 1000, Tipo.DEPOSITO, valor, descricao, destino=self.numero))
+
+    def sacar(self, valor: int, descricao: str = ""):
+        self._sacar_raw(valor)
+        self.historico.append(Transacao(time.time_ns() // 1000, Tipo.SAQUE, valor, descricao, origem=self.numero))
+
+    def _depositar_raw(self, valor: int):
         if valor <= 0:
             raise ValorInvalido("valor deve ser positivo")
         self.saldo += valor
-        self.historico.append(Transacao(datetime.utcnow(), "DEPOSITO", valor, descricao, destino=self.numero))
 
-    def sacar(self, valor: Decimal, descricao: str = ""):
+    def _sacar_raw(self, valor: int):
         if valor <= 0:
             raise ValorInvalido("valor deve ser positivo")
         if self.saldo < valor:
             raise SaldoInsuficiente("saldo insuficiente")
         self.saldo -= valor
-        self.historico.append(Transacao(datetime.utcnow(), "SAQUE", valor, descricao, origem=self.numero))
 
 class Banco:
     def __init__(self):
         self._clientes_por_cpf: Dict[str, Cliente] = {}
         self._contas_por_numero: Dict[str, Conta] = {}
+        self._contas_por_cliente: Dict[str, List[Conta]] = defaultdict(list)
+        self._numeros_ordenados: List[int] = []
+        self._contas_ordenadas: List[Conta] = []
         self._seq_cliente = 1
         self._seq_conta = 1001
 
     def criar_cliente(self, nome: str, cpf: str) -> Cliente:
+        cpf = sys.intern(cpf)
         if cpf in self._clientes_por_cpf:
             return self._clientes_por_cpf[cpf]
         c = Cliente(self._seq_cliente, nome, cpf)
@@ -69,12 +140,16 @@ class Banco:
         return c
 
     def abrir_conta(self, cpf: str) -> Conta:
-        cliente = self._clientes_por_cpf.get(cpf)
+        cliente = self._clientes_por_cpf.get(sys.intern(cpf))
         if not cliente:
             raise EntidadeNaoEncontrada("cliente não encontrado")
-        numero = str(self._seq_conta)
+        numero = sys.intern(str(self._seq_conta))
         conta = Conta(numero, cliente)
         self._contas_por_numero[numero] = conta
+        self._contas_por_cliente[cliente.cpf].append(conta)
+        # números são sequenciais: append mantém a lista ordenada
+        self._numeros_ordenados.append(self._seq_conta)
+        self._contas_ordenadas.append(conta)
         self._seq_conta += 1
         return conta
 
@@ -84,45 +159,59 @@ class Banco:
             raise EntidadeNaoEncontrada("conta não encontrada")
         return conta
 
+    def contas_no_intervalo(self, lo: int, hi: int) -> List[Conta]:
+        i = bisect_left(self._numeros_ordenados, lo)
+        j = bisect_right(self._numeros_ordenados, hi)
+        return self._contas_ordenadas[i:j]
+
     def depositar(self, numero: str, valor: Decimal):
-        self.buscar_conta(numero).depositar(self._to_money(valor), "depósito")
+        self.buscar_conta(numero).depositar(self._to_cents(valor), _DESC_DEPOSITO)
 
     def sacar(self, numero: str, valor: Decimal):
-        self.buscar_conta(numero).sacar(self._to_money(valor), "saque")
+        self.buscar_conta(numero).sacar(self._to_cents(valor), _DESC_SAQUE)
 
     def transferir(self, origem: str, destino: str, valor: Decimal):
         if origem == destino:
             raise ValorInvalido("contas iguais")
-        v = self._to_money(valor)
+        v = self._to_cents(valor)
         co = self.buscar_conta(origem)
         cd = self.buscar_conta(destino)
-        co.sacar(v, f"transferência para {destino}")
-        cd.depositar(v, f"transferência de {origem}")
-        t = Transacao(datetime.utcnow(), "TRANSFERENCIA", v, "transferência", origem=origem, destino=destino)
+        co._sacar_raw(v)
+        cd._depositar_raw(v)
+        t = Transacao(time.time_ns() // 1000, Tipo.TRANSFERENCIA, v, _DESC_TRANSFERENCIA, origem=origem, destino=destino)
         co.historico.append(t)
         cd.historico.append(t)
 
-    def listar_clientes_e_contas(self) -> List[Tuple[Cliente, List[Conta]]]:
-        m: Dict[str, List[Conta]] = {}
-        for conta in self._contas_por_numero.values():
-            m.setdefault(conta.cliente.cpf, []).append(conta)
+    def listar_clientes_e_contas(self) -> List[Tuple[Cliente, Tuple[Conta, ...]]]:
         out = []
         for cpf, cliente in self._clientes_por_cpf.items():
-            out.append((cliente, m.get(cpf, [])))
+            # tupla: as listas do índice _contas_por_cliente não vazam para quem chama
+            out.append((cliente, tuple(self._contas_por_cliente.get(cpf, ()))))
         return out
 
-    def extrato(self, numero: str) -> List[Transacao]:
-        return list(self.buscar_conta(numero).historico)
+    def extrato(self, numero: str) -> Sequence[Transacao]:
+        return _ReadOnlyList(self.buscar_conta(numero).historico)
 
-    def _to_money(self, valor) -> Decimal:
-        if isinstance(valor, Decimal):
-            v = valor
+    def _to_cents(self, valor) -> int:
+        if type(valor) is int:
+            cents = valor * 100
         else:
             try:
-                v = Decimal(str(valor))
-            except InvalidOperation:
+                if type(valor) is Decimal:
+                    d = valor
+                elif type(valor) is str:
+                    d = Decimal(valor)
+                else:
+                    d = Decimal(str(valor))
+                cents = int(d.quantize(_CENTS, context=_MONEY_CTX).scaleb(2, _MONEY_CTX))
+            except (ValueError, OverflowError, InvalidOperation):
                 raise ValorInvalido("valor inválido")
-        return v.quantize(Decimal("0.01"))
+        if abs(cents) > _MAX_CENTS:
+            raise ValorInvalido("valor inválido")
+        return cents
+
+def formatted_saldo(centavos: int) -> str:
+    return f"{centavos // 100}.{centavos % 100:02d}"
 
 def criar_dados_mock() -> Banco:
     banco = Banco()
@@ -142,7 +231,7 @@ def criar_dados_mock() -> Banco:
 if __name__ == "__main__":
     banco = criar_dados_mock()
     for cliente, contas in banco.listar_clientes_e_contas():
-        print(cliente.id, cliente.nome, cliente.cpf, "->", [(c.numero, f"{c.saldo:.2f}") for c in contas])
+        print(cliente.id, cliente.nome, cliente.cpf, "->", [(c.numero, formatted_saldo(c.saldo)) for c in contas])
     n = next(iter({c.numero for _, cs in banco.listar_clientes_e_contas() for c in cs}))
     for t in banco.extrato(n):
-        print(n, t.momento.isoformat(), t.tipo, f"{t.valor:.2f}", t.descricao)
+        print(n, datetime.fromtimestamp(t.momento / 1e6, tz=timezone.utc).isoformat(), _TIPO_NAMES[t.tipo], formatted_saldo(t.valor), t.descricao)
@@ -0,0 +1,90 @@
+# Kernels Numba do processamento em lote de RefactoredClasses.
+# Ficam fora de RefactoredClasses para que o build mypyc daquele módulo não os compile:
+# o Numba só faz JIT de funções Python puras.
+
+try:
+    import numpy as np  # type: ignore[import-untyped, import-not-found]
+    from numba import njit, prange  # type: ignore[import-untyped, import-not-found]
+except ImportError:
+    np = njit = prange = None  # type: ignore[assignment, misc]
+
+LOTE_OK = 0
+LOTE_VALOR_INVALIDO = 1
+LOTE_SALDO_INSUFICIENTE = 2
+
+# o cache do Numba é por arquivo fonte e grava o nome do módulo: importado também como
+# solid.LoteNumba, um nome quebraria o cache do outro, então só o nome de topo usa cache
+_CACHE = __name__ == "LoteNumba"
+
+# mesmos códigos de RefactoredClasses.Tipo
+TIPO_DEPOSITO = 0
+TIPO_SAQUE = 1
+
+if njit is not None:
+    @njit(cache=_CACHE, nogil=True, inline="always")
+    def _aplicar_linha(saldos, i, v, t):
+        if v <= 0 or (t != TIPO_DEPOSITO and t != TIPO_SAQUE):
+            return LOTE_VALOR_INVALIDO
+        if t == TIPO_SAQUE:
+            if saldos[i] < v:
+                return LOTE_SALDO_INSUFICIENTE
+            saldos[i] -= v
+        else:
+            saldos[i] += v
+        return LOTE_OK
+
+    @njit(cache=_CACHE, nogil=True, fastmath=True)
+    def aplicar_lote(saldos, idx, vals, tipos, hist_conta, hist_valor, hist_tipo, hist_time,
+                     cursor, momento, status):
+        for k in range(idx.shape[0]):
+            st = _aplicar_linha(saldos, idx[k], vals[k], tipos[k])
+            status[k] = st
+            if st == LOTE_OK:
+                hist_conta[cursor] = idx[k]
+                hist_valor[cursor] = vals[k]
+                hist_tipo[cursor] = tipos[k]
+                hist_time[cursor] = momento
+                cursor += 1
+        return cursor
+
+    @njit(cache=_CACHE, nogil=True)
+    def segmentar(idx, n_contas):
+        # ordena as linhas por conta, estável: contas[s] é a s-ésima conta tocada pelo lote e
+        # ordem[inicios[s]:inicios[s + 1]] são as linhas dela, na ordem do lote
+        n = idx.shape[0]
+        if n_contas <= 4 * n:
+            # lote denso: counting sort, O(n + n_contas)
+            pos = np.zeros(n_contas + 1, dtype=np.int64)
+            for k in range(n):
+                pos[idx[k] + 1] += 1
+            for i in range(n_contas):
+                pos[i + 1] += pos[i]
+            ordem = np.empty(n, dtype=np.int64)
+            for k in range(n):
+                ordem[pos[idx[k]]] = k
+                pos[idx[k]] += 1
+        else:
+            # poucas linhas para muitas contas: não paga O(n_contas)
+            ordem = np.argsort(idx, kind="mergesort")
+        contas = np.empty(n, dtype=np.int64)
+        inicios = np.empty(n + 1, dtype=np.int64)
+        s = 0
+        for p in range(n):
+            i = idx[ordem[p]]
+            if p == 0 or i != contas[s - 1]:
+                contas[s] = i
+                inicios[s] = p
+                s += 1
+        inicios[s] = n
+        return ordem, contas[:s], inicios[:s + 1]
+
+    @njit(cache=_CACHE, nogil=True, parallel=True)
+    def aplicar_lote_paralelo(saldos, vals, tipos, ordem, contas, inicios, status):
+        # um segmento (conta) por iteração: threads diferentes nunca tocam o mesmo saldos[i]
+        for s in prange(contas.shape[0]):
+            i = contas[s]
+            for p in range(inicios[s], inicios[s + 1]):
+                k = ordem[p]
+                status[k] = _aplicar_linha(saldos, i, vals[k], tipos[k])
+else:
+    aplicar_lote = aplicar_lote_paralelo = segmentar = None
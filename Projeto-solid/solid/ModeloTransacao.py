@@ -0,0 +1,36 @@
+# Modelo Transacao de RefactoredClasses (e o enum Tipo que ela usa).
+# Fica fora de RefactoredClasses para que o build mypyc daquele módulo não o compile: assim a
+# escolha entre recordclass e dataclass é feita aqui, na importação, tanto no módulo puro
+# quanto no compilado.
+
+from dataclasses import dataclass
+from enum import IntEnum
+
+try:
+    from recordclass import dataobject  # type: ignore[import-untyped, import-not-found]
+except ImportError:
+    dataobject = None
+
+class Tipo(IntEnum):
+    DEPOSITO = 0
+    SAQUE = 1
+    TRANSFERENCIA = 2
+
+if dataobject is not None:
+    # dataobject: sem __dict__ e fora do GC cíclico
+    class Transacao(dataobject):
+        momento: int
+        tipo: Tipo
+        valor: int
+        descricao: str
+        origem: str = ""
+        destino: str = ""
+else:
+    @dataclass
+    class Transacao:  # type: ignore[no-redef]
+        momento: int
+        tipo: Tipo
+        valor: int
+        descricao: str
+        origem: str = ""
+        destino: str = ""
@@ -1,11 +1,51 @@
 # Refatoração com SRP, OCP e DIP
 
+import atexit
+import sys
+import time
+from array import array
+from collections.abc import Sequence
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from dataclasses import dataclass, field
-from decimal import Decimal, InvalidOperation, getcontext
-from datetime import datetime
-from typing import List, Dict, Protocol
+from itertools import repeat
+from decimal import ROUND_HALF_EVEN, Context, Decimal, InvalidOperation, getcontext
+from types import TracebackType
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Set, Tuple, Type, Union
+
+try:
+    import numpy as np  # type: ignore[import-untyped, import-not-found]
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+try:
+    from ModeloTransacao import Tipo, Transacao
+except ImportError:
+    # importado como pacote (solid.RefactoredClasses), sem solid/ no sys.path
+    from solid.ModeloTransacao import Tipo, Transacao  # type: ignore[no-redef, import-not-found]
+
+try:
+    from LoteNumba import LOTE_OK, aplicar_lote as _aplicar_lote
+    from LoteNumba import aplicar_lote_paralelo as _aplicar_lote_paralelo, segmentar as _segmentar
+except ImportError:
+    try:
+        # importado como pacote (solid.RefactoredClasses), sem solid/ no sys.path
+        from solid.LoteNumba import LOTE_OK, aplicar_lote as _aplicar_lote  # type: ignore[no-redef, import-not-found]
+        from solid.LoteNumba import aplicar_lote_paralelo as _aplicar_lote_paralelo  # type: ignore[no-redef, import-not-found]
+        from solid.LoteNumba import segmentar as _segmentar  # type: ignore[no-redef, import-not-found]
+    except ImportError:
+        # sem o módulo do kernel, aplicar_lote levanta ErroBanco como sem numba
+        LOTE_OK = 0
+        _aplicar_lote = _aplicar_lote_paralelo = _segmentar = None  # type: ignore[assignment]
 
 getcontext().prec = 28
+# centavos limitados a int64 (o mesmo do lote) para qualquer tipo de entrada;
+# prec=19 cobre todos os dígitos desse intervalo no quantize
+_MONEY_CTX = Context(prec=19, rounding=ROUND_HALF_EVEN)
+_MAX_CENTS = 2**63 - 1
+_CENTS = Decimal("0.01")
+
+Valor = Union[int, float, str, Decimal]
 
 # --- EXCEÇÕES ---
 
@@ -15,90 +55,306 @@ class SaldoInsuficiente(ErroBanco): pass
 class EntidadeNaoEncontrada(ErroBanco): pass
 
 # --- MODELOS ---
+# Tipo e Transacao vêm de ModeloTransacao (recordclass quando disponível, senão dataclass)
 
-@dataclass(frozen=True)
+_DESC_DEPOSITO = sys.intern("Depósito")
+_DESC_SAQUE = sys.intern("Saque")
+_DESC_TRANSFERENCIA = sys.intern("Transferência")
+# indexados pelo código do tipo, para registrar_lote mapear colunas inteiras em C
+_TIPOS = tuple(Tipo)
+_DESC_LOTE = (_DESC_DEPOSITO, _DESC_SAQUE)
+
+# Cliente fica sempre como dataclass: dataobject ignoraria o __eq__/__hash__ por id
+@dataclass(frozen=True, slots=True, eq=False)
 class Cliente:
     id: int
     nome: str
     cpf: str
 
-@dataclass
-class Transacao:
-    momento: datetime
-    tipo: str
-    valor: Decimal
-    descricao: str
-    origem: str = ""
-    destino: str = ""
+    # identidade do cliente é o id: hash/eq num único int em vez da tupla dos três campos
+    def __hash__(self) -> int:
+        return self.id
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return other.id == self.id  # type: ignore[attr-defined]
 
 # --- RESPONSABILIDADE ÚNICA: REGISTRO DE TRANSAÇÕES ---
 
+class _ReadOnlyList(Sequence):
+    """Visão somente leitura (e viva) do histórico; materializa Transacao por acesso, sem copiar."""
+    __slots__ = ("_registro",)
+
+    def __init__(self, registro: "RegistroTransacoes"):
+        self._registro = registro
+
+    def __len__(self) -> int:
+        return self._registro._n
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Transacao, List[Transacao]]:  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self._linha(j) for j in range(*i.indices(len(self)))]
+        return self._linha(i)
+
+    def _linha(self, i: int) -> Transacao:
+        r = self._registro
+        if i < 0:
+            i += r._n
+        if not 0 <= i < r._n:
+            raise IndexError("índice fora do histórico")
+        return Transacao(r.momentos[i], Tipo(r.tipos[i]), r.valores[i], r.descricoes[i], r.origens[i], r.destinos[i])
+
+    def __iter__(self) -> Iterator[Transacao]:
+        r = self._registro
+        for _, m, t, v, d, o, de in zip(range(r._n), r.momentos, iter(r.tipos), r.valores, r.descricoes,
+                                        r.origens, r.destinos):
+            yield Transacao(m, Tipo(t), v, d, o, de)
+
+class SinkTransacoes(Protocol):
+    """Destino de persistência dos lotes.
+
+    ``(conta, inicio + k)`` identifica a k-ésima transação do lote, então reenviar um lote é idempotente.
+    """
+    def write_batch(self, conta: str, inicio: int, transacoes: List[Transacao]) -> None: pass
+
+class _PendentesSink:
+    """Transações de uma conta ainda não enviadas ao sink.
+
+    Só buffers com pendentes ficam em _buffers_pendentes (e, por ele, no atexit): o flush
+    na saída não mantém vivos Banco, Conta nem o histórico, só até ``batch - 1`` transações.
+    """
+    __slots__ = ("sink", "conta", "batch", "pendentes", "persistidas")
+
+    def __init__(self, sink: SinkTransacoes, conta: str, batch: int) -> None:
+        self.sink = sink
+        self.conta = conta
+        self.batch = batch
+        self.pendentes: List[Transacao] = []
+        self.persistidas = 0
+
+    def adicionar(self, transacao: Transacao) -> None:
+        if not self.pendentes:
+            _buffers_pendentes.add(self)
+        self.pendentes.append(transacao)
+        if len(self.pendentes) >= self.batch:
+            self.flush()
+
+    def estender(self, transacoes: Iterable[Transacao]) -> None:
+        if not self.pendentes:
+            _buffers_pendentes.add(self)
+        self.pendentes.extend(transacoes)
+        if len(self.pendentes) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pendentes:
+            return
+        self.sink.write_batch(self.conta, self.persistidas, self.pendentes)
+        self.persistidas += len(self.pendentes)
+        self.pendentes = []
+        _buffers_pendentes.discard(self)
+
+_buffers_pendentes: Set[_PendentesSink] = set()
+
+def _flush_pendentes() -> None:
+    for buffer in list(_buffers_pendentes):
+        buffer.flush()
+
+atexit.register(_flush_pendentes)
+
 class RegistroTransacoes:
-    def __init__(self):
-        self._historico: List[Transacao] = []
+    """Histórico em colunas paralelas (SoA); Transacao só é materializada em listar().
+
+    ``capacity_hint`` pré-aloca as colunas; ``_n`` marca quantas linhas estão ocupadas.
+    Com ``sink``, as transações também são acumuladas e enviadas em lotes de ``batch``;
+    o lote incompleto sai em flush(), ao fim de um ``with Banco(...)`` ou no atexit.
+    """
+    __slots__ = ("momentos", "tipos", "valores", "descricoes", "origens", "destinos", "_n", "_buffer")
+
+    def __init__(self, capacity_hint: int = 0, sink: Optional[SinkTransacoes] = None, batch: int = 1024,
+                 conta: str = "") -> None:
+        self.momentos = array("q", [0]) * capacity_hint
+        self.tipos = bytearray(capacity_hint)
+        self.valores = array("q", [0]) * capacity_hint
+        self.descricoes: List[str] = [""] * capacity_hint
+        self.origens: List[str] = [""] * capacity_hint
+        self.destinos: List[str] = [""] * capacity_hint
+        self._n = 0
+        self._buffer = _PendentesSink(sink, conta, batch) if sink is not None else None
+
+    def registrar(self, transacao: Transacao) -> None:
+        n = self._n
+        if n < len(self.valores):
+            self.momentos[n] = transacao.momento
+            self.tipos[n] = transacao.tipo
+            self.valores[n] = transacao.valor
+            self.descricoes[n] = transacao.descricao
+            self.origens[n] = transacao.origem
+            self.destinos[n] = transacao.destino
+        else:
+            self.momentos.append(transacao.momento)
+            self.tipos.append(transacao.tipo)
+            self.valores.append(transacao.valor)
+            self.descricoes.append(transacao.descricao)
+            self.origens.append(transacao.origem)
+            self.destinos.append(transacao.destino)
+        self._n = n + 1
+        if self._buffer is not None:
+            self._buffer.adicionar(transacao)
+
+    def registrar_lote(self, numero: str, momento: int, tipos: bytes, valores: "array[int]") -> None:
+        """Anexa de uma vez depósitos/saques da conta ``numero``, um por byte de ``tipos``."""
+        n = self._n
+        fim = n + len(tipos)
+        descricoes = list(map(_DESC_LOTE.__getitem__, tipos))
+        origens = list(map(("", numero).__getitem__, tipos))
+        destinos = list(map((numero, "").__getitem__, tipos))
+        # dentro da capacidade pré-alocada a fatia sobrescreve; além dela, estende a coluna
+        self.momentos[n:fim] = array("q", [momento]) * len(tipos)
+        self.tipos[n:fim] = tipos
+        self.valores[n:fim] = valores
+        self.descricoes[n:fim] = descricoes
+        self.origens[n:fim] = origens
+        self.destinos[n:fim] = destinos
+        self._n = fim
+        if self._buffer is not None:
+            self._buffer.estender(map(Transacao, repeat(momento), map(_TIPOS.__getitem__, tipos), valores,
+                                      descricoes, origens, destinos))
 
-    def registrar(self, transacao: Transacao):
-        self._historico.append(transacao)
+    def flush(self) -> None:
+        if self._buffer is not None:
+            self._buffer.flush()
 
-    def listar(self) -> List[Transacao]:
-        return list(self._historico)
+    def listar(self) -> Sequence[Transacao]:
+        return _ReadOnlyList(self)
+
+    def listar_copia(self) -> List[Transacao]:
+        return list(_ReadOnlyList(self))
+
+    def sum_by_tipo(self, tipo: int) -> int:
+        if np is None:
+            return sum(v for _, v, t in zip(range(self._n), self.valores, iter(self.tipos)) if t == tipo)
+        valores = np.frombuffer(self.valores, dtype=np.int64, count=self._n)
+        tipos = np.frombuffer(self.tipos, dtype=np.uint8, count=self._n)
+        return int(valores[tipos == tipo].sum())
 
 # --- CONTA BANCÁRIA ---
 
-@dataclass
+# slots=True: subclasses injetadas via Banco(conta_cls=...) também devem declarar __slots__
+@dataclass(slots=True)
 class Conta:
     numero: str
     cliente: Cliente
-    saldo: Decimal = Decimal("0.00")
+    saldo: int = 0
     transacoes: RegistroTransacoes = field(default_factory=RegistroTransacoes)
 
-    def depositar(self, valor: Decimal, descricao: str = ""):
+    def depositar(self, valor: int, descricao: str = "") -> None:
+        self._depositar_raw(valor)
+        self.transacoes.registrar(Transacao(time.time_ns() // 1000, Tipo.DEPOSITO, valor, descricao, destino=self.numero))
+
+    def sacar(self, valor: int, descricao: str = "") -> None:
+        self._sacar_raw(valor)
+        self.transacoes.registrar(Transacao(time.time_ns() // 1000, Tipo.SAQUE, valor, descricao, origem=self.numero))
+
+    def transferir_para(self, destino: "Conta", valor: int, momento: Optional[int] = None) -> None:
+        if self.numero == destino.numero:
+            raise ValorInvalido("contas iguais")
+        if valor <= 0:
+            raise ValorInvalido("valor deve ser positivo")
+        if self.saldo < valor:
+            raise SaldoInsuficiente("saldo insuficiente")
+        self.saldo -= valor
+        destino.saldo += valor
+        if momento is None:
+            momento = time.time_ns() // 1000
+        t = Transacao(momento, Tipo.TRANSFERENCIA, valor, _DESC_TRANSFERENCIA, self.numero, destino.numero)
+        self.transacoes.registrar(t)
+        destino.transacoes.registrar(t)
+
+    def _depositar_raw(self, valor: int) -> None:
         if valor <= 0:
             raise ValorInvalido("valor deve ser positivo")
         self.saldo += valor
-        self.transacoes.registrar(Transacao(datetime.utcnow(), "DEPOSITO", valor, descricao, destino=self.numero))
 
-    def sacar(self, valor: Decimal, descricao: str = ""):
+    def _sacar_raw(self, valor: int) -> None:
         if valor <= 0:
             raise ValorInvalido("valor deve ser positivo")
         if self.saldo < valor:
             raise SaldoInsuficiente("saldo insuficiente")
         self.saldo -= valor
-        self.transacoes.registrar(Transacao(datetime.utcnow(), "SAQUE", valor, descricao, origem=self.numero))
 
 # --- ABSTRAÇÃO PARA OPERAÇÕES (OCP) ---
 
 class Operacao(Protocol):
-    def executar(self): pass
+    def executar(self) -> None: pass
 
 @dataclass
 class Transferencia:
     origem: Conta
     destino: Conta
-    valor: Decimal
+    valor: int
 
-    def executar(self):
-        if self.origem.numero == self.destino.numero:
-            raise ValorInvalido("contas iguais")
-        self.origem.sacar(self.valor, f"Transferência para {self.destino.numero}")
-        self.destino.depositar(self.valor, f"Transferência de {self.origem.numero}")
-        transacao = Transacao(datetime.utcnow(), "TRANSFERENCIA", self.valor, "Transferência",
-                              origem=self.origem.numero, destino=self.destino.numero)
-        self.origem.transacoes.registrar(transacao)
-        self.destino.transacoes.registrar(transacao)
+    def executar(self) -> None:
+        self.origem.transferir_para(self.destino, self.valor)
+
+# --- PROCESSAMENTO EM LOTE (int centavos, Numba) ---
+
+class SoAState:
+    """Espelho colunar dos saldos e do histórico usado por Banco.aplicar_lote.
+
+    ``saldos`` persiste entre lotes; cada lote recarrega só as contas que toca, pois o
+    caminho OO altera Conta.saldo sem passar por aqui.
+    """
+    __slots__ = ("saldos", "hist_conta", "hist_valor", "hist_tipo", "hist_time", "cursor")
+
+    def __init__(self, n_contas: int = 0, capacidade: int = 0) -> None:
+        self.saldos = np.zeros(n_contas, dtype=np.int64)
+        self.hist_conta = np.empty(capacidade, dtype=np.int32)
+        self.hist_valor = np.empty(capacidade, dtype=np.int64)
+        self.hist_tipo = np.empty(capacidade, dtype=np.int8)
+        self.hist_time = np.empty(capacidade, dtype=np.int64)
+        self.cursor = 0
+
+    def cobrir(self, n_contas: int) -> None:
+        atual = self.saldos.shape[0]
+        if n_contas > atual:
+            novo = np.zeros(max(n_contas, 2 * atual), dtype=np.int64)
+            novo[:atual] = self.saldos
+            self.saldos = novo
+
+    def reservar(self, n: int) -> None:
+        necessario = self.cursor + n
+        if necessario <= self.hist_valor.shape[0]:
+            return
+        capacidade = max(necessario, 2 * self.hist_valor.shape[0])
+        for nome in ("hist_conta", "hist_valor", "hist_tipo", "hist_time"):
+            antigo = getattr(self, nome)
+            novo = np.empty(capacidade, dtype=antigo.dtype)
+            novo[:self.cursor] = antigo[:self.cursor]
+            setattr(self, nome, novo)
 
 # --- BANCO (DIP: usando dependências via construtor) ---
 
 class Banco:
-    def __init__(self, cliente_cls=Cliente, conta_cls=Conta):
+    def __init__(self, cliente_cls: Type[Cliente] = Cliente, conta_cls: Type[Conta] = Conta,
+                 historico_capacity: int = 0, sink: Optional[SinkTransacoes] = None, batch: int = 1024) -> None:
         self._clientes_por_cpf: Dict[str, Cliente] = {}
         self._contas_por_numero: Dict[str, Conta] = {}
+        self._contas_por_cliente: Dict[str, List[Conta]] = defaultdict(list)
+        self._numeros_ordenados: List[int] = []
+        self._contas_ordenadas: List[Conta] = []
         self._seq_cliente = 1
         self._seq_conta = 1001
         self._cliente_cls = cliente_cls
         self._conta_cls = conta_cls
+        self._historico_capacity = historico_capacity
+        self._sink = sink
+        self._batch = batch
+        self._lote: Optional[SoAState] = None
 
     def criar_cliente(self, nome: str, cpf: str) -> Cliente:
+        cpf = sys.intern(cpf)
         if cpf in self._clientes_por_cpf:
             return self._clientes_por_cpf[cpf]
         c = self._cliente_cls(self._seq_cliente, nome, cpf)
@@ -107,12 +363,20 @@ class Banco:
         return c
 
     def abrir_conta(self, cpf: str) -> Conta:
-        cliente = self._clientes_por_cpf.get(cpf)
+        cliente = self._clientes_por_cpf.get(sys.intern(cpf))
         if not cliente:
             raise EntidadeNaoEncontrada("cliente não encontrado")
-        numero = str(self._seq_conta)
-        conta = self._conta_cls(numero, cliente)
+        numero = sys.intern(str(self._seq_conta))
+        if self._historico_capacity or self._sink is not None:
+            registro = RegistroTransacoes(self._historico_capacity, self._sink, self._batch, numero)
+            conta = self._conta_cls(numero, cliente, transacoes=registro)
+        else:
+            conta = self._conta_cls(numero, cliente)
         self._contas_por_numero[numero] = conta
+        self._contas_por_cliente[cliente.cpf].append(conta)
+        # números são sequenciais: append mantém a lista ordenada
+        self._numeros_ordenados.append(self._seq_conta)
+        self._contas_ordenadas.append(conta)
         self._seq_conta += 1
         return conta
 
@@ -122,27 +386,137 @@ class Banco:
             raise EntidadeNaoEncontrada("conta não encontrada")
         return conta
 
-    def depositar(self, numero: str, valor):
-        self.buscar_conta(numero).depositar(self._to_money(valor), "Depósito")
+    def contas_no_intervalo(self, lo: int, hi: int) -> List[Conta]:
+        i = bisect_left(self._numeros_ordenados, lo)
+        j = bisect_right(self._numeros_ordenados, hi)
+        return self._contas_ordenadas[i:j]
+
+    def depositar(self, numero: str, valor: Valor) -> None:
+        self.buscar_conta(numero).depositar(self._to_cents(valor), _DESC_DEPOSITO)
+
+    def sacar(self, numero: str, valor: Valor) -> None:
+        self.buscar_conta(numero).sacar(self._to_cents(valor), _DESC_SAQUE)
+
+    def transferir(self, origem: str, destino: str, valor: Valor) -> None:
+        # caminho direto; Transferencia segue disponível como Operacao plugável (OCP)
+        self.buscar_conta(origem).transferir_para(self.buscar_conta(destino), self._to_cents(valor))
+
+    def aplicar_lote(self, numeros_idx, valores_cents, tipos, paralelo: bool = False):
+        """Aplica depósitos/saques em lote; índices seguem a ordem de abertura das contas.
+
+        Retorna um array com um status LoteNumba.LOTE_* por linha. Linhas rejeitadas não
+        alteram saldo; as aceitas entram no extrato de cada conta (e no sink) e no
+        histórico colunar de ``self.lote``. Com ``paralelo``, as contas são processadas em
+        threads (prange, sem GIL); as linhas de uma mesma conta continuam sendo aplicadas
+        na ordem do lote.
+        """
+        if np is None or _aplicar_lote is None:
+            raise ErroBanco("aplicar_lote requer numpy e numba")
+        idx = self._array_lote(numeros_idx)
+        vals = self._array_lote(valores_cents)
+        tps = self._array_lote(tipos)
+        if not (idx.shape == vals.shape == tps.shape):
+            raise ValorInvalido("arrays do lote com tamanhos diferentes")
+        contas = self._contas_ordenadas
+        # limites checados nos valores originais, antes do cast (que truncaria)
+        if idx.size:
+            if idx.min() < 0 or idx.max() >= len(contas):
+                raise EntidadeNaoEncontrada("conta não encontrada")
+            if vals.max() > np.iinfo(np.int64).max:
+                raise ValorInvalido("valor fora do intervalo")
+            # só o que não cabe em int8; tipos sem suporte no lote (ex.: TRANSFERENCIA)
+            # voltam por linha como LOTE_VALOR_INVALIDO
+            if tps.min() < np.iinfo(np.int8).min or tps.max() > np.iinfo(np.int8).max:
+                raise ValorInvalido("tipo fora do intervalo")
+        idx = np.ascontiguousarray(idx, dtype=np.int32)
+        vals = np.ascontiguousarray(vals, dtype=np.int64)
+        tps = np.ascontiguousarray(tps, dtype=np.int8)
+        if self._lote is None:
+            self._lote = SoAState()
+        lote = self._lote
+        lote.cobrir(len(contas))
+        lote.reservar(idx.shape[0])
+        # linhas agrupadas por conta; o custo em Python daqui em diante é por conta tocada
+        ordem, tocadas, inicios = _segmentar(idx, len(contas))
+        numeros = tocadas.tolist()
+        lote.saldos[tocadas] = [contas[i].saldo for i in numeros]
+        status = np.empty(idx.shape[0], dtype=np.int8)
+        momento = time.time_ns() // 1000
+        if paralelo:
+            _aplicar_lote_paralelo(lote.saldos, vals, tps, ordem, tocadas, inicios, status)
+            ok = status == LOTE_OK
+            fim = lote.cursor + int(ok.sum())
+            lote.hist_conta[lote.cursor:fim] = idx[ok]
+            lote.hist_valor[lote.cursor:fim] = vals[ok]
+            lote.hist_tipo[lote.cursor:fim] = tps[ok]
+            lote.hist_time[lote.cursor:fim] = momento
+            lote.cursor = fim
+        else:
+            lote.cursor = _aplicar_lote(lote.saldos, idx, vals, tps, lote.hist_conta, lote.hist_valor,
+                                        lote.hist_tipo, lote.hist_time, lote.cursor, momento, status)
+        for i, saldo in zip(numeros, lote.saldos[tocadas].tolist()):
+            contas[i].saldo = saldo
+        # extrato, sum_by_tipo e sink acompanham o saldo: as linhas aceitas de cada conta
+        # entram no RegistroTransacoes dela numa única chamada
+        ok_ordem = status[ordem] == LOTE_OK
+        aceitas = ordem[ok_ordem]
+        cortes = np.concatenate(([0], np.cumsum(ok_ordem)))[inicios].tolist()
+        tipos_ok = tps[aceitas].tobytes()
+        valores_ok = vals[aceitas].tobytes()
+        for s, i in enumerate(numeros):
+            a, b = cortes[s], cortes[s + 1]
+            if a < b:
+                conta = contas[i]
+                conta.transacoes.registrar_lote(conta.numero, momento, tipos_ok[a:b],
+                                                array("q", valores_ok[8 * a:8 * b]))
+        return status
+
+    def _array_lote(self, valores):
+        a = np.asarray(valores)
+        if a.size == 0:
+            return np.empty(0, dtype=np.int64)
+        if a.ndim != 1 or a.dtype.kind not in "iu":
+            raise ValorInvalido("arrays do lote devem ser vetores de inteiros")
+        return a
+
+    @property
+    def lote(self) -> Optional[SoAState]:
+        return self._lote
+
+    def flush(self) -> None:
+        """Envia ao sink as transações pendentes de todas as contas."""
+        for conta in self._contas_ordenadas:
+            conta.transacoes.flush()
 
-    def sacar(self, numero: str, valor):
-        self.buscar_conta(numero).sacar(self._to_money(valor), "Saque")
+    def __enter__(self) -> "Banco":
+        return self
 
-    def transferir(self, origem: str, destino: str, valor):
-        op = Transferencia(self.buscar_conta(origem), self.buscar_conta(destino), self._to_money(valor))
-        op.executar()
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        self.flush()
 
-    def extrato(self, numero: str) -> List[Transacao]:
+    def extrato(self, numero: str) -> Sequence[Transacao]:
         return self.buscar_conta(numero).transacoes.listar()
 
-    def listar_clientes_e_contas(self):
-        m: Dict[str, List[Conta]] = {}
-        for conta in self._contas_por_numero.values():
-            m.setdefault(conta.cliente.cpf, []).append(conta)
-        return [(cliente, m.get(cliente.cpf, [])) for cliente in self._clientes_por_cpf.values()]
+    def listar_clientes_e_contas(self) -> List[Tuple[Cliente, Tuple[Conta, ...]]]:
+        # tupla: as listas do índice _contas_por_cliente não vazam para quem chama
+        return [(cliente, tuple(self._contas_por_cliente.get(cliente.cpf, ())))
+                for cliente in self._clientes_por_cpf.values()]
 
-    def _to_money(self, valor) -> Decimal:
-        try:
-            return Decimal(str(valor)).quantize(Decimal("0.01"))
-        except InvalidOperation:
+    def _to_cents(self, valor: Valor) -> int:
+        if type(valor) is int:
+            cents = valor * 100
+        else:
+            try:
+                if type(valor) is Decimal:
+                    d = valor
+                elif type(valor) is str:
+                    d = Decimal(valor)
+                else:
+                    d = Decimal(str(valor))
+                cents = int(d.quantize(_CENTS, context=_MONEY_CTX).scaleb(2, _MONEY_CTX))
+            except (ValueError, OverflowError, InvalidOperation):
+                raise ValorInvalido("valor inválido")
+        if abs(cents) > _MAX_CENTS:
             raise ValorInvalido("valor inválido")
+        return cents
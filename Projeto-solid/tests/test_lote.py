@@ -0,0 +1,106 @@
+# Equivalência entre os kernels sequencial e paralelo de Banco.aplicar_lote.
+# Rodar a partir de Projeto-solid: python -m unittest discover -s tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "solid"))
+
+import RefactoredClasses as R  # noqa: E402
+from LoteNumba import LOTE_OK, LOTE_SALDO_INSUFICIENTE, LOTE_VALOR_INVALIDO  # noqa: E402
+
+try:
+    import numba  # noqa: F401
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _banco(saldos):
+    banco = R.Banco()
+    banco.criar_cliente("Ana", "1")
+    for saldo in saldos:
+        conta = banco.abrir_conta("1")
+        if saldo:
+            banco.depositar(conta.numero, saldo)
+    return banco
+
+
+def _referencia(saldos, idx, vals, tipos):
+    # mesma regra de _aplicar_linha, linha a linha em Python
+    saldos = [s * 100 for s in saldos]
+    status = []
+    for i, v, t in zip(idx, vals, tipos):
+        if v <= 0 or t not in (R.Tipo.DEPOSITO, R.Tipo.SAQUE):
+            status.append(LOTE_VALOR_INVALIDO)
+        elif t == R.Tipo.SAQUE and saldos[i] < v:
+            status.append(LOTE_SALDO_INSUFICIENTE)
+        else:
+            saldos[i] += v if t == R.Tipo.DEPOSITO else -v
+            status.append(LOTE_OK)
+    return saldos, status
+
+
+@unittest.skipIf(np is None or R._aplicar_lote is None, "requer numpy e numba")
+class AplicarLoteTest(unittest.TestCase):
+
+    def _aplicar(self, saldos, idx, vals, tipos):
+        """Aplica o lote nos dois kernels e confere um contra o outro e contra a referência."""
+        esperado_saldos, esperado_status = _referencia(saldos, idx, vals, tipos)
+        resultados = []
+        for paralelo in (False, True):
+            banco = _banco(saldos)
+            status = banco.aplicar_lote(np.array(idx, dtype=np.int64), np.array(vals, dtype=np.int64),
+                                        np.array(tipos, dtype=np.int64), paralelo=paralelo)
+            contas = banco._contas_ordenadas
+            self.assertEqual(status.tolist(), esperado_status)
+            self.assertEqual([c.saldo for c in contas], esperado_saldos)
+            for c in contas:
+                r = c.transacoes
+                self.assertEqual(r.sum_by_tipo(R.Tipo.DEPOSITO) - r.sum_by_tipo(R.Tipo.SAQUE), c.saldo)
+            lote = banco.lote
+            resultados.append((
+                [[(t.tipo, t.valor, t.origem, t.destino, t.descricao) for t in banco.extrato(c.numero)]
+                 for c in contas],
+                lote.hist_conta[:lote.cursor].tolist(),
+                lote.hist_valor[:lote.cursor].tolist(),
+                lote.hist_tipo[:lote.cursor].tolist(),
+            ))
+        self.assertEqual(resultados[0], resultados[1])
+        return resultados[0]
+
+    def test_contas_repetidas_no_lote(self):
+        extratos, hist_conta, _, _ = self._aplicar(
+            [0, 0, 0], [2, 0, 2, 2, 0], [100, 200, 300, 50, 25], [0, 0, 0, 1, 1])
+        self.assertEqual([v for _, v, _, _, _ in extratos[2]], [100, 300, 50])
+        self.assertEqual(hist_conta, [2, 0, 2, 2, 0])
+
+    def test_saldo_insuficiente_no_meio_do_lote(self):
+        extratos, _, _, _ = self._aplicar(
+            [1], [0, 0, 0, 0, 0], [60, 60, 50, 60, 100], [1, 1, 0, 1, 1])
+        self.assertEqual([(t, v) for t, v, _, _, _ in extratos[0]][1:],
+                         [(R.Tipo.SAQUE, 60), (R.Tipo.DEPOSITO, 50), (R.Tipo.SAQUE, 60)])
+
+    def test_linhas_rejeitadas(self):
+        extratos, hist_conta, _, _ = self._aplicar(
+            [5, 0], [0, 1, 0, 1, 0], [0, -10, 100, 100, 100], [0, 0, R.Tipo.TRANSFERENCIA, 127, 1])
+        self.assertEqual([len(e) for e in extratos], [2, 0])
+        self.assertEqual(hist_conta, [0])
+
+    def test_lote_vazio(self):
+        extratos, hist_conta, _, _ = self._aplicar([3, 4], [], [], [])
+        self.assertEqual([len(e) for e in extratos], [1, 1])
+        self.assertEqual(hist_conta, [])
+
+    def test_lote_esparso_e_denso(self):
+        # poucas linhas para muitas contas (mergesort) e muitas linhas para poucas (counting sort)
+        rng = np.random.default_rng(0)
+        for n_contas, n_linhas in ((500, 20), (20, 5000)):
+            saldos = rng.integers(0, 50, n_contas).tolist()
+            self._aplicar(saldos, rng.integers(0, n_contas, n_linhas).tolist(),
+                          rng.integers(-5, 3000, n_linhas).tolist(), rng.integers(0, 3, n_linhas).tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()